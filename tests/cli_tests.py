@@ -9,6 +9,7 @@ import sys
 
 from contextlib import redirect_stdout
 from datetime import datetime
+from time import monotonic
 from unittest.mock import patch
 
 from trafilatura import cli, cli_utils, utils
@@ -93,6 +94,7 @@ def test_sysoutput():
         args = cli.parse_args(testargs)
     filepath, destdir = cli_utils.determine_output_path(args, args.outputdir, '')
     assert len(filepath) >= 10 and filepath.endswith('.csv')
+    assert cli_utils.determine_extension(args) == '.csv'
     assert destdir == '/root/forbidden/'
     assert cli_utils.check_outputdir_status(args.outputdir) is False
     testargs = ['', '--xml', '-o', '/tmp/you-touch-my-tralala']
@@ -107,6 +109,22 @@ def test_sysoutput():
     args2.xml, args2.json = False, True
     filepath2, destdir2 = cli_utils.determine_output_path(args, args.outputdir, '', new_filename='AAZZ')
     assert filepath2.endswith('AAZZ.json')
+    # precomputed extension
+    filepath2, destdir2 = cli_utils.determine_output_path(args, args.outputdir, '', new_filename='AAZZ', extension='.txt')
+    assert filepath2.endswith('AAZZ.txt')
+    # test collision handling for random file names
+    existing_path = os.path.join(args.outputdir, 'AAZZ.txt')
+    with open(existing_path, 'w') as f:
+        f.write('original')
+    new_path = cli_utils.write_new_file(existing_path, 'DADIDA')
+    assert new_path != existing_path and new_path.endswith('.txt')
+    assert os.path.dirname(new_path) == args.outputdir
+    with open(existing_path, 'r') as f:
+        assert f.read() == 'original'
+    with open(new_path, 'r') as f:
+        assert f.read() == 'DADIDA'
+    os.remove(existing_path)
+    os.remove(new_path)
     # test directory counter
     assert cli_utils.determine_counter_dir('testdir', 0) == 'testdir/1'
     # test file writing
@@ -162,13 +180,13 @@ def test_download():
     testdict['test.org'] = ['http://test.org/1']
     assert cli_utils.draw_backoff_url(testdict, backoffdict, 0, 0) == ('http://test.org/1', dict(), dict(), 0)
     testdict['test.org'] = ['http://test.org/1']
-    backoffdict['test.org'] = datetime(2019, 5, 18, 15, 17, 8, 132263)
+    backoffdict['test.org'] = monotonic() - 3600
     assert cli_utils.draw_backoff_url(testdict, backoffdict, 0, 0) == ('http://test.org/1', dict(), dict(), 0)
     testdict['test.org'] = ['http://test.org/1']
-    backoffdict['test.org'] = datetime(2019, 5, 18, 15, 17, 8, 132263)
+    backoffdict['test.org'] = monotonic() - 3600
     assert cli_utils.draw_backoff_url(testdict, backoffdict, 0, 3) == ('http://test.org/1', dict(), dict(), 3)
     testdict['test.org'] = ['http://test.org/1']
-    backoffdict['test.org'] = datetime(2030, 5, 18, 15, 17, 8, 132263)
+    backoffdict['test.org'] = monotonic() + 3600
     assert cli_utils.draw_backoff_url(testdict, backoffdict, 0, 3) == ('http://test.org/1', dict(), dict(), 0)
 
 
@@ -223,9 +241,11 @@ def test_cli_pipeline():
     testargs = ['', '-out', 'json']
     with patch.object(sys, 'argv', testargs):
         args = cli.parse_args(testargs)
+    assert cli_utils.extraction_options(args)['output_format'] == 'json'
     with open(os.path.join(resources_dir, 'httpbin_sample.html'), 'r') as f:
         teststring = f.read()
     assert cli.examine(teststring, args) is not None
+    assert cli.examine(teststring, args, options=cli_utils.extraction_options(args)) is not None
     # dry-run file processing pipeline
     testargs = ['', '--parallel', '1', '--inputdir', '/dev/null']
     with patch.object(sys, 'argv', testargs):
@@ -12,14 +12,18 @@ import re
 import signal
 import string
 import sys
+import threading
 
-from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from multiprocessing import Pool
-from os import makedirs, path, walk
-from time import sleep
+from os import makedirs, path, stat, walk
+from time import monotonic, sleep
+
+try:
+    from os import scandir
+except ImportError:  # Python 3.4
+    scandir = None
 
 from courlan import extract_domain, validate_url
 
@@ -34,6 +38,13 @@ from .utils import fetch_url
 LOGGER = logging.getLogger(__name__)
 random.seed(345)  # make generated file names reproducible
 
+DIRNAME_REGEX = re.compile(r'[^/]+$')
+EXTENSION_REGEX = re.compile(r'\.[a-z]{2,5}$')
+CHARCLASS = string.ascii_letters + string.digits
+ENSURED_DIRS = set()  # output directories known to exist
+READ_BUFFER = 2**20
+WORKER_PROCESSING = None  # set in each file processing worker
+
 
 # try signal https://stackoverflow.com/questions/492519/timeout-on-a-function-call
 def handler(signum, frame):
@@ -41,19 +52,32 @@ def handler(signum, frame):
     raise Exception('unusual file processing time, aborting')
 
 
+def set_timeout():
+    '''Put the timeout signal in place, the handler is only registered once'''
+    # signals are unavailable on Windows and outside of the main thread
+    if not hasattr(signal, 'SIGALRM') or threading.current_thread() is not threading.main_thread():
+        LOGGER.debug('timeout signal not available, processing without timeout')
+        return False
+    if signal.getsignal(signal.SIGALRM) is not handler:
+        signal.signal(signal.SIGALRM, handler)
+    signal.alarm(PROCESSING_TIMEOUT)
+    return True
+
+
 def load_input_urls(filename):
     '''Read list of URLs to process'''
     input_urls = []
     try:
-        # optional: errors='strict', buffering=1
-        with open(filename, mode='r', encoding='utf-8') as inputfile:
+        # optional: errors='strict'
+        with open(filename, mode='r', encoding='utf-8', buffering=READ_BUFFER) as inputfile:
             for line in inputfile:
-                url_match = re.match(r'https?://[^ ]+', line.strip())  # if not line.startswith('http'):
-                try:
-                    input_urls.append(url_match.group(0))
-                except AttributeError:
+                # cut at first space
+                url = line.strip().split(' ', 1)[0]
+                # cheap prefix test instead of a regular expression
+                if url.startswith(('http://', 'https://')) and url.index('://') + 3 < len(url):
+                    input_urls.append(url)
+                else:
                     LOGGER.warning('Not an URL, discarding line: %s', line)
-                    continue
     except UnicodeDecodeError:
         sys.exit('ERROR: system, file type or buffer encoding')
     return input_urls
@@ -61,33 +85,28 @@ def load_input_urls(filename):
 
 def load_blacklist(filename):
     '''Read list of unwanted URLs'''
-    blacklist = set()
-    with open(filename, mode='r', encoding='utf-8') as inputfh:
-        for line in inputfh:
-            url = line.strip()
-            blacklist.add(url)
-            # add http/https URLs for safety
-            if url.startswith('https'):
-                blacklist.add(re.sub(r'^https:', 'http:', url))
-            else:
-                blacklist.add(re.sub(r'^http:', 'https:', url))
+    with open(filename, mode='r', encoding='utf-8', buffering=READ_BUFFER) as inputfh:
+        urls = [line.strip() for line in inputfh]
+    blacklist = set(urls)
+    # add http/https URLs for safety
+    blacklist.update('http:' + url[6:] for url in urls if url.startswith('https:'))
+    blacklist.update('https:' + url[5:] for url in urls if url.startswith('http:'))
     return blacklist
 
 
-
 def check_outputdir_status(directory):
     '''Check if the output directory is within reach and writable'''
+    # directory already checked
+    if directory in ENSURED_DIRS:
+        return True
     # check the directory status
-    if not path.exists(directory) or not path.isdir(directory):
-        try:
-            makedirs(directory, exist_ok=True)
-        except OSError:
-            # maybe the directory has already been created
-            #sleep(0.25)
-            #if not path.exists(directory) or not path.isdir(directory):
-            sys.stderr.write('ERROR: Destination directory cannot be created: ' + directory + '\n')
-            # raise OSError()
-            return False
+    try:
+        makedirs(directory, exist_ok=True)
+    except OSError:
+        sys.stderr.write('ERROR: Destination directory cannot be created: ' + directory + '\n')
+        # raise OSError()
+        return False
+    ENSURED_DIRS.add(directory)
     return True
 
 
@@ -100,105 +119,176 @@ def determine_counter_dir(dirname, counter):
     return path.join(dirname, counter_dir)
 
 
-def get_writable_path(destdir, extension):
-    '''Find a writable path and return it along with its random file name'''
-    charclass = string.ascii_letters + string.digits
-    filename = ''.join(random.choice(charclass) for _ in range(FILENAME_LEN))
-    output_path = path.join(destdir, filename + extension)
-    while path.exists(output_path):
-        filename = ''.join(random.choice(charclass) for _ in range(FILENAME_LEN))
-        output_path = path.join(destdir, filename + extension)
-    return output_path, filename
+def random_filename():
+    '''Draw a random alphanumeric file name of fixed length'''
+    try:
+        # Python >= 3.6
+        return ''.join(random.choices(CHARCLASS, k=FILENAME_LEN))
+    except AttributeError:
+        return ''.join(random.choice(CHARCLASS) for _ in range(FILENAME_LEN))
+
 
+def get_random_path(destdir, extension):
+    '''Draw a random file name and return it along with the corresponding path,
+       the path is not checked for existence, see write_new_file'''
+    filename = random_filename()
+    return path.join(destdir, filename + extension), filename
 
-def determine_output_path(args, orig_filename, content, counter=None, new_filename=None):
-    '''Pick a directory based on selected options and a file name based on output type'''
-    # determine extension
-    extension = '.txt'
+
+def write_new_file(output_path, content):
+    '''Create a file with a random name without overwriting existing ones,
+       draw another name in case of collision and return the final path'''
+    while True:
+        try:
+            with open(output_path, mode='x', encoding='utf-8') as outputfile:
+                outputfile.write(content)
+            return output_path
+        except FileExistsError:
+            output_path, _ = get_random_path(path.dirname(output_path), path.splitext(output_path)[1])
+
+
+def determine_extension(args):
+    '''Return the file extension corresponding to the output format'''
     if args.xml or args.xmltei or args.output_format == 'xml':
-        extension = '.xml'
-    elif args.csv or args.output_format == 'csv':
-        extension = '.csv'
-    elif args.json or args.output_format == 'json':
-        extension = '.json'
+        return '.xml'
+    if args.csv or args.output_format == 'csv':
+        return '.csv'
+    if args.json or args.output_format == 'json':
+        return '.json'
+    return '.txt'
+
+
+def determine_output_path(args, orig_filename, content, counter=None, new_filename=None, extension=None):
+    '''Pick a directory based on selected options and a file name based on output type'''
+    output_path, destination_directory, _ = select_output_path(args, orig_filename, content, counter, new_filename, extension)
+    return output_path, destination_directory
+
+
+def select_output_path(args, orig_filename, content, counter=None, new_filename=None, extension=None):
+    '''Determine the output path and directory, and whether the file name has been drawn at random'''
+    # determine extension if it has not been precomputed
+    if extension is None:
+        extension = determine_extension(args)
+    random_name = False
     # use cryptographic hash on file contents to define name
     if args.hash_as_name is True:
         new_filename = content_fingerprint(content)[:27].replace('/', '-')
     # determine directory
     if args.keep_dirs is True:
         # strip directory
-        orig_directory = re.sub(r'[^/]+$', '', orig_filename)
+        orig_directory = DIRNAME_REGEX.sub('', orig_filename)
         destination_directory = path.join(args.outputdir, orig_directory)
         # strip extension
-        filename = re.sub(r'\.[a-z]{2,5}$', '', orig_filename)
+        filename = EXTENSION_REGEX.sub('', orig_filename)
         output_path = path.join(args.outputdir, filename + extension)
     else:
         destination_directory = determine_counter_dir(args.outputdir, counter)
         # determine file slug
         if new_filename is None:
-            output_path, _ = get_writable_path(destination_directory, extension)
+            output_path, _ = get_random_path(destination_directory, extension)
+            random_name = True
         else:
             output_path = path.join(destination_directory, new_filename + extension)
-    return output_path, destination_directory
+    return output_path, destination_directory, random_name
 
 
 def archive_html(htmlstring, args, counter=None):
     '''Write a copy of raw HTML in backup directory'''
     destination_directory = determine_counter_dir(args.backup_dir, counter)
-    output_path, filename = get_writable_path(destination_directory, '.html')
+    output_path, filename = get_random_path(destination_directory, '.html')
     # check the directory status
     if check_outputdir_status(destination_directory) is True:
         # write
-        with open(output_path, mode='w', encoding='utf-8') as outputfile:
-            outputfile.write(htmlstring)
+        output_path = write_new_file(output_path, htmlstring)
+        filename = path.splitext(path.basename(output_path))[0]
     return filename
 
 
-def write_result(result, args, orig_filename=None, counter=None, new_filename=None):
+def write_result(result, args, orig_filename=None, counter=None, new_filename=None, extension=None):
     '''Deal with result (write to STDOUT or to file)'''
     if result is None:
         return
     if args.outputdir is None:
         sys.stdout.write(result + '\n')
     else:
-        destination_path, destination_directory = determine_output_path(args, orig_filename, result, counter, new_filename)
+        destination_path, destination_directory, random_name = select_output_path(args, orig_filename, result, counter, new_filename, extension)
         # check the directory status
         if check_outputdir_status(destination_directory) is True:
-            with open(destination_path, mode='w', encoding='utf-8') as outputfile:
-                outputfile.write(result)
+            # do not overwrite existing files with random names
+            if random_name is True:
+                write_new_file(destination_path, result)
+            else:
+                with open(destination_path, mode='w', encoding='utf-8') as outputfile:
+                    outputfile.write(result)
 
 
 def generate_filelist(inputdir):
     '''Walk the directory tree and output all file names'''
-    for root, _, inputfiles in walk(inputdir):
-        for fname in inputfiles:
-            yield path.join(root, fname)
-
-
-def file_processing(filename, args, counter=None):
+    # Python 3.4
+    if scandir is None:
+        for root, _, inputfiles in walk(inputdir):
+            for fname in inputfiles:
+                yield path.join(root, fname)
+        return
+    # use cached file type information instead of further stat calls
+    stack = [inputdir]
+    while stack:
+        try:
+            entries = scandir(stack.pop())
+        # skip unreadable directories like os.walk does
+        except OSError:
+            continue
+        try:
+            for entry in entries:
+                # do not recurse into symlinked directories, as os.walk
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                # symlinked files are processed, as os.walk lists them
+                elif entry.is_file():
+                    yield entry.path
+        # release the directory handle if the generator is abandoned
+        finally:
+            if hasattr(entries, 'close'):  # Python >= 3.6
+                entries.close()
+
+
+def file_processing(filename, args, counter=None, extension=None, options=None):
     '''Aggregated functions to process a file in a list'''
+    # check the size before reading the file
+    filesize = stat(filename).st_size
+    if filesize > MAX_FILE_SIZE:
+        sys.stderr.write('ERROR: file too large\n')
+        return
+    if filesize < MIN_FILE_SIZE:
+        sys.stderr.write('ERROR: file too small\n')
+        return
     with open(filename, 'rb') as inputf:
-        htmlstring = inputf.read()
-    result = examine(htmlstring, args, url=args.URL)
-    write_result(result, args, filename, counter, new_filename=None)
+        htmlstring = inputf.read(MAX_FILE_SIZE)
+    result = examine(htmlstring, args, url=args.URL, options=options)
+    write_result(result, args, filename, counter, new_filename=None, extension=extension)
+
+
+def filter_urls(blacklist, input_urls):
+    '''Control blacklist, check for invalid URLs and deduplicate in a single pass'''
+    seen = set()
+    for url in input_urls:
+        if url in seen or (blacklist and url in blacklist):
+            continue
+        seen.add(url)
+        if validate_url(url)[0] is True:
+            yield url
 
 
 def url_processing_checks(blacklist, input_urls):
     '''Filter and deduplicate input urls'''
-    # control blacklist
-    if blacklist:
-        input_urls = [u for u in input_urls if u not in blacklist]
-    # check for invalid URLs
-    if input_urls:
-        input_urls = [u for u in input_urls if validate_url(u)[0] is True]
-    # deduplicate
-    if input_urls:
-        return list(OrderedDict.fromkeys(input_urls))
+    checked_urls = list(filter_urls(blacklist, input_urls))
+    if checked_urls:
+        return checked_urls
     LOGGER.error('No URLs to process, invalid or blacklisted input')
     return []
 
 
-def process_result(htmlstring, args, url, counter):
+def process_result(htmlstring, args, url, counter, extension=None, options=None):
     '''Extract text and metadata from a download webpage and eventually write out the result'''
     # backup option
     if args.backup_dir:
@@ -206,78 +296,85 @@ def process_result(htmlstring, args, url, counter):
     else:
         fileslug = None
     # process
-    result = examine(htmlstring, args, url=url)
-    write_result(result, args, orig_filename=None, counter=None, new_filename=fileslug)
+    result = examine(htmlstring, args, url=url, options=options)
+    write_result(result, args, orig_filename=None, counter=None, new_filename=fileslug, extension=extension)
     # increment written file counter
     if counter is not None:
         counter += 1
     return counter
 
 
-def draw_backoff_url(domain_dict, backoff_dict, sleeptime, i):
-    '''Select a random URL from the domains pool and apply backoff rule'''
-    domain = random.choice(list(domain_dict))
+def draw_backoff_url(domain_dict, backoff_dict, sleeptime, i, domain_keys=None):
+    '''Select a random URL from the domains pool and apply backoff rule,
+       domain_keys can be passed along to avoid listing the domains on each call'''
+    if domain_keys is None:
+        domain_keys = list(domain_dict)
+    position = random.randrange(len(domain_keys))
+    domain = domain_keys[position]
     # safeguard
-    if domain in backoff_dict and \
-        (datetime.now() - backoff_dict[domain]).total_seconds() < sleeptime:
+    last_visit = backoff_dict.get(domain)
+    if last_visit is not None and monotonic() - last_visit < sleeptime:
         i += 1
         if i >= len(domain_dict)*3:
             LOGGER.debug('spacing request for domain name %s', domain)
             sleep(sleeptime)
             i = 0
     # draw URL
-    url = domain_dict[domain].pop()
+    domain_urls = domain_dict[domain]
+    url = domain_urls.pop()
     # clean registries
-    if not domain_dict[domain]:
+    if not domain_urls:
         del domain_dict[domain]
-        try:
-            del backoff_dict[domain]
-        except KeyError:
-            pass
+        # swap with the last key to remove it in constant time
+        domain_keys[position] = domain_keys[-1]
+        domain_keys.pop()
+        backoff_dict.pop(domain, None)
     # register backoff
     else:
-        backoff_dict[domain] = datetime.now()
+        backoff_dict[domain] = monotonic()
     return url, domain_dict, backoff_dict, i
 
 
-def single_threaded_processing(domain_dict, backoff_dict, args, sleeptime, counter):
+def single_threaded_processing(domain_dict, backoff_dict, args, sleeptime, counter, extension=None, options=None):
     '''Implement a single threaded processing algorithm'''
     # start with a higher level
     i = 3
     errors = []
+    domain_keys = list(domain_dict)
     while domain_dict:
-        url, domain_dict, backoff_dict, i = draw_backoff_url(domain_dict, backoff_dict, sleeptime, i)
+        url, domain_dict, backoff_dict, i = draw_backoff_url(domain_dict, backoff_dict, sleeptime, i, domain_keys)
         htmlstring = fetch_url(url)
         if htmlstring is not None:
-            counter = process_result(htmlstring, args, url, counter)
+            counter = process_result(htmlstring, args, url, counter, extension, options)
         else:
             LOGGER.debug('No result for URL: %s', url)
             errors.append(url)
     return errors, counter
 
 
-def multi_threaded_processing(domain_dict, args, sleeptime, counter):
+def multi_threaded_processing(domain_dict, args, sleeptime, counter, extension=None, options=None):
     '''Implement a multi-threaded processing algorithm'''
     i, backoff_dict, errors = 0, dict(), []
     download_threads = args.parallel or DOWNLOAD_THREADS
-    while domain_dict:
-        # the remaining list is too small, process it differently
-        if len({x for v in domain_dict.values() for x in v}) < download_threads:
-            errors, counter = single_threaded_processing(domain_dict, backoff_dict, args, sleeptime, counter)
-            return errors, counter
-        # populate buffer
-        bufferlist = []
-        while len(bufferlist) < download_threads:
-            url, domain_dict, backoff_dict, i = draw_backoff_url(domain_dict, backoff_dict, sleeptime, i)
-            bufferlist.append(url)
-        # start several threads
-        with ThreadPoolExecutor(max_workers=download_threads) as executor:
-            future_to_url = {executor.submit(fetch_url, url): url for url in bufferlist}
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                # handle result
-                if future.result() is not None:
-                    counter = process_result(future.result(), args, url, counter)
+    remaining = sum(len(v) for v in domain_dict.values())
+    domain_keys = list(domain_dict)
+    # reuse the same threads for all batches
+    with ThreadPoolExecutor(max_workers=download_threads) as executor:
+        while domain_dict:
+            # the remaining list is too small, process it differently
+            if remaining < download_threads:
+                errors, counter = single_threaded_processing(domain_dict, backoff_dict, args, sleeptime, counter, extension, options)
+                return errors, counter
+            # populate buffer
+            bufferlist = []
+            while len(bufferlist) < download_threads:
+                url, domain_dict, backoff_dict, i = draw_backoff_url(domain_dict, backoff_dict, sleeptime, i, domain_keys)
+                bufferlist.append(url)
+            remaining -= len(bufferlist)
+            # download in several threads, results are handled in input order
+            for url, htmlstring in zip(bufferlist, executor.map(fetch_url, bufferlist)):
+                if htmlstring is not None:
+                    counter = process_result(htmlstring, args, url, counter, extension, options)
                 else:
                     LOGGER.debug('No result for URL: %s', url)
                     errors.append(url)
@@ -286,38 +383,55 @@ def multi_threaded_processing(domain_dict, args, sleeptime, counter):
 
 def url_processing_pipeline(args, input_urls, sleeptime):
     '''Aggregated functions to show a list and download and process an input list'''
-    input_urls = url_processing_checks(args.blacklist, input_urls)
+    extension = determine_extension(args)
+    options = extraction_options(args)
     # print list without further processing
     if args.list:
-        for url in input_urls:
-            write_result(url, args)  # print('\n'.join(input_urls))
+        for url in url_processing_checks(args.blacklist, input_urls):
+            write_result(url, args, extension=extension)  # print('\n'.join(input_urls))
         return None
-    # build domain-aware processing list
+    # filter the input and build domain-aware processing list at once
     domain_dict = dict()
-    while input_urls:
-        url = input_urls.pop()
-        domain_name = extract_domain(url)
-        if domain_name not in domain_dict:
-            domain_dict[domain_name] = []
-        domain_dict[domain_name].append(url)
+    for url in filter_urls(args.blacklist, input_urls):
+        domain_dict.setdefault(extract_domain(url), []).append(url)
+    if not domain_dict:
+        LOGGER.error('No URLs to process, invalid or blacklisted input')
     # initialize file counter if necessary
-    if len(input_urls) > MAX_FILES_PER_DIRECTORY:
+    if sum(len(v) for v in domain_dict.values()) > MAX_FILES_PER_DIRECTORY:
         counter = 0
     else:
         counter = None
     if len(domain_dict) <= 5:
-        errors, counter = single_threaded_processing(domain_dict, dict(), args, sleeptime, counter)
+        errors, counter = single_threaded_processing(domain_dict, dict(), args, sleeptime, counter, extension, options)
     else:
-        errors, counter = multi_threaded_processing(domain_dict, args, sleeptime, counter)
+        errors, counter = multi_threaded_processing(domain_dict, args, sleeptime, counter, extension, options)
     LOGGER.debug('%s URLs could not be found', len(errors))
     # option to retry
     if args.archived is True:
         domain_dict = dict()
         domain_dict['archive.org'] = ['https://web.archive.org/web/20/' + e for e in errors]
-        archived_errors, _ = single_threaded_processing(domain_dict, dict(), args, sleeptime, counter)
+        archived_errors, _ = single_threaded_processing(domain_dict, dict(), args, sleeptime, counter, extension, options)
         LOGGER.debug('%s archived URLs out of %s could not be found', len(archived_errors), len(errors))
 
 
+def init_worker(args, extension=None, options=None):
+    '''Pass the processing arguments once to each worker process'''
+    global WORKER_PROCESSING
+    WORKER_PROCESSING = partial(file_processing, args=args, extension=extension, options=options)
+
+
+def worker_file_processing(filename, counter=None):
+    '''Process a file with the arguments registered by init_worker'''
+    WORKER_PROCESSING(filename, counter=counter)
+
+
+def process_filebatch(pool, filebatch, counter, processing_cores):
+    '''Dispatch a batch of files to the worker pool in chunks'''
+    chunksize = max(1, len(filebatch)//(processing_cores*4))
+    for _ in pool.imap_unordered(partial(worker_file_processing, counter=counter), filebatch, chunksize=chunksize):
+        pass
+
+
 def file_processing_pipeline(args):
     '''Define batches for parallel file processing and perform the extraction'''
     #if not args.outputdir:
@@ -327,26 +441,37 @@ def file_processing_pipeline(args):
     filebatch = []
     filecounter = None
     processing_cores = args.parallel or FILE_PROCESSING_CORES
+    extension = determine_extension(args)
+    options = extraction_options(args)
     # loop
-    for filename in generate_filelist(args.inputdir):
-        filebatch.append(filename)
-        if len(filebatch) > MAX_FILES_PER_DIRECTORY:
-            if filecounter is None:
-                filecounter = 0
-            # multiprocessing for the batch
-            with Pool(processes=processing_cores) as pool:
-                pool.map(partial(file_processing, args=args, counter=filecounter), filebatch)
+    with Pool(processes=processing_cores, initializer=init_worker, initargs=(args, extension, options)) as pool:
+        for filename in generate_filelist(args.inputdir):
+            filebatch.append(filename)
+            if len(filebatch) > MAX_FILES_PER_DIRECTORY:
+                if filecounter is None:
+                    filecounter = 0
+                # multiprocessing for the batch
+                process_filebatch(pool, filebatch, filecounter, processing_cores)
+                filecounter += len(filebatch)
+                filebatch = []
+        # update counter
+        if filecounter is not None:
             filecounter += len(filebatch)
-            filebatch = []
-    # update counter
-    if filecounter is not None:
-        filecounter += len(filebatch)
-    # multiprocessing for the rest
-    with Pool(processes=processing_cores) as pool:
-        pool.map(partial(file_processing, args=args, counter=filecounter), filebatch)
+        # multiprocessing for the rest
+        process_filebatch(pool, filebatch, filecounter, processing_cores)
+
+
+def extraction_options(args):
+    '''Map command-line arguments to the parameters of the extract function'''
+    return {'no_fallback': args.fast,
+            'include_comments': args.nocomments, 'include_tables': args.notables,
+            'include_formatting': args.formatting,
+            'with_metadata': args.with_metadata,
+            'output_format': args.output_format, 'tei_validation': args.validate,
+            'target_language': args.target_language, 'deduplicate': args.deduplicate}
 
 
-def examine(htmlstring, args, url=None):
+def examine(htmlstring, args, url=None, options=None):
     """Generic safeguards and triggers"""
     result = None
     # safety check
@@ -359,20 +484,16 @@ def examine(htmlstring, args, url=None):
     # proceed
     else:
         # put timeout signal in place
-        if args.timeout is True:
-            signal.signal(signal.SIGALRM, handler)
-            signal.alarm(PROCESSING_TIMEOUT)
+        timeout_set = args.timeout is True and set_timeout()
         try:
-            result = extract(htmlstring, url=url, no_fallback=args.fast,
-                             include_comments=args.nocomments, include_tables=args.notables,
-                             include_formatting=args.formatting,
-                             with_metadata=args.with_metadata,
-                             output_format=args.output_format, tei_validation=args.validate,
-                             target_language=args.target_language, deduplicate=args.deduplicate)
+            # map arguments if the options have not been precomputed
+            if options is None:
+                options = extraction_options(args)
+            result = extract(htmlstring, url=url, **options)
         # ugly but efficient
         except Exception as err:
             sys.stderr.write('ERROR: ' + str(err) + '\nDetails: ' + str(sys.exc_info()[0]) + '\n')
         # deactivate
-        if args.timeout is True:
+        if timeout_set:
             signal.alarm(0)
     return result